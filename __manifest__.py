@@ -17,6 +17,9 @@ This module provides barcode and QR code label generation and printing:
 * Print from: products, sales orders, purchase orders, pickings, invoices
 * Page orientation control (portrait/landscape)
 * Multiple label sizes support
+* Reprint only the labels whose price or barcode changed since the last print
+* Direct printing to network printers over raw sockets (port 9100)
+* Streaming CSV/JSON export of label data for external label software
 
 Uses python-barcode and qrcode libraries for generation.
 
@@ -28,11 +31,13 @@ Requires the Barcode Scanner Base module.
     'depends': [
         'barcode_scanner_base',
         'product',
+        'stock',
     ],
     'data': [
         'security/ir.model.access.csv',
         'data/paperformat_data.xml',
         'views/product_label_views.xml',
+        'views/label_printer_views.xml',
         'wizard/product_label_wizard_views.xml',
         'report/product_label_report.xml',
         'report/product_label_templates.xml',
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+import csv
+import io
+import json
+import logging
+
+from odoo import api, http
+from odoo.http import content_disposition, request, Response
+from odoo.modules.registry import Registry
+
+from ..wizard.product_label_wizard import EXPORT_FIELDS, LINE_BATCH_SIZE
+
+_logger = logging.getLogger(__name__)
+
+EXPORT_CONTENT_TYPES = {
+    'csv': 'text/csv;charset=utf-8',
+    'json': 'application/json;charset=utf-8',
+}
+
+
+def iter_export_chunks(rows, export_format, chunk_size=LINE_BATCH_SIZE):
+    """Serialize label rows into encoded chunks of ``chunk_size`` rows.
+
+    CSV output starts with a header in ``EXPORT_FIELDS`` order; JSON
+    output is a single array of objects.
+
+    Args:
+        rows: iterable of dictionaries keyed by ``EXPORT_FIELDS``
+        export_format: 'csv' or 'json'
+        chunk_size: number of rows written per chunk
+
+    Yields:
+        UTF-8 encoded bytes
+    """
+    buffer = io.StringIO()
+    if export_format == 'csv':
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+        writer.writeheader()
+    else:
+        buffer.write('[')
+
+    count = 0
+    for row in rows:
+        if export_format == 'csv':
+            writer.writerow(row)
+        else:
+            if count:
+                buffer.write(',')
+            buffer.write(json.dumps(row, ensure_ascii=False))
+        count += 1
+        if count % chunk_size == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+
+    if export_format == 'json':
+        buffer.write(']')
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+class ProductLabelExportController(http.Controller):
+
+    @http.route(
+        '/barcode_scanner_label/export/<int:wizard_id>/<string:export_format>',
+        type='http',
+        auth='user',
+    )
+    def export_labels(self, wizard_id, export_format, **kwargs):
+        """Stream the label rows of a wizard as CSV or JSON."""
+        if export_format not in EXPORT_CONTENT_TYPES:
+            raise request.not_found()
+
+        wizard = request.env['product.label.wizard'].browse(wizard_id).exists()
+        if not wizard:
+            raise request.not_found()
+        wizard.check_access('read')
+
+        filename = 'product_labels.%s' % export_format
+        headers = [
+            ('Content-Type', EXPORT_CONTENT_TYPES[export_format]),
+            ('Content-Disposition', content_disposition(filename)),
+        ]
+        stream = self._stream_export(
+            request.env.cr.dbname,
+            request.env.uid,
+            dict(request.env.context),
+            wizard.id,
+            export_format,
+        )
+        return Response(stream, headers=headers, direct_passthrough=True)
+
+    @staticmethod
+    def _stream_export(dbname, uid, context, wizard_id, export_format):
+        """Generate the export body chunk by chunk.
+
+        The generator is consumed by the WSGI server after the request
+        cursor has been closed, so it reads through its own cursor. One
+        chunk is written per batch of label lines, which keeps memory use
+        flat regardless of the number of rows.
+        """
+        with Registry(dbname).cursor() as cr:
+            env = api.Environment(cr, uid, context)
+            wizard = env['product.label.wizard'].browse(wizard_id)
+            yield from iter_export_chunks(wizard._iter_export_rows(), export_format)
+            _logger.info("Exported labels of wizard %s as %s", wizard_id, export_format)
@@ -1,3 +1,5 @@
 # -*- coding: utf-8 -*-
 from . import product_label
 from . import product_product
+from . import product_label_print_history
+from . import label_printer
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+from odoo import fields, models, _
+from odoo.exceptions import UserError
+from odoo.tools.pdf import merge_pdf
+
+from .raw_printer import DEFAULT_PORT, RawPrinterError, get_dispatcher
+
+
+class LabelPrinter(models.Model):
+    _name = 'label.printer'
+    _description = 'Label Printer'
+    _order = 'sequence, name'
+
+    name = fields.Char(
+        string='Printer Name',
+        required=True,
+    )
+    sequence = fields.Integer(
+        string='Sequence',
+        default=10,
+    )
+    active = fields.Boolean(
+        string='Active',
+        default=True,
+    )
+    company_id = fields.Many2one(
+        comodel_name='res.company',
+        string='Company',
+        default=lambda self: self.env.company,
+    )
+
+    # Connection settings
+    host = fields.Char(
+        string='Host',
+        required=True,
+        help="Hostname or IP address of the network printer",
+    )
+    port = fields.Integer(
+        string='Port',
+        default=DEFAULT_PORT,
+        required=True,
+        help="Raw socket port of the printer (usually 9100)",
+    )
+    timeout = fields.Float(
+        string='Timeout (s)',
+        default=10.0,
+    )
+    keep_alive = fields.Float(
+        string='Keep Connection Open (s)',
+        default=0.0,
+        help="How long the connection stays open for the next print job. "
+             "Leave to 0 for printers that accept a single connection or "
+             "only print once the connection is closed",
+    )
+    retries = fields.Integer(
+        string='Retries',
+        default=3,
+        help="Number of retries, with exponential backoff, before a job fails",
+    )
+    retry_backoff = fields.Float(
+        string='Retry Backoff (s)',
+        default=0.5,
+        help="Delay before the first retry; doubled on each further retry",
+    )
+
+    _sql_constraints = [
+        ('port_range', 'CHECK(port > 0 AND port < 65536)',
+         'The printer port must be between 1 and 65535.'),
+    ]
+
+    def _get_dispatcher_config(self):
+        """Get the connection settings of the printer.
+
+        Returns:
+            dictionary of keyword arguments for the raw printer dispatcher
+        """
+        self.ensure_one()
+        return {
+            'host': self.host,
+            'port': self.port,
+            'timeout': self.timeout or 10.0,
+            'retries': max(self.retries, 0),
+            'backoff': self.retry_backoff,
+            'idle_timeout': max(self.keep_alive, 0.0),
+        }
+
+    def _print_raw(self, payloads):
+        """Send PDF print jobs to the printer right away.
+
+        A PDF stream cannot be concatenated with another one, so several
+        jobs are merged into a single document and sent in one connection
+        session.
+
+        Args:
+            payloads: list of PDF documents (bytes), one per job
+
+        Returns:
+            number of bytes sent
+        """
+        self.ensure_one()
+        if len(payloads) > 1:
+            payloads = [merge_pdf(payloads)]
+        try:
+            return get_dispatcher(**self._get_dispatcher_config()).send(payloads)
+        except RawPrinterError as e:
+            raise UserError(_('Printing to %(printer)s failed: %(error)s',
+                              printer=self.name, error=e)) from e
+
+    def action_test_connection(self):
+        """Check that the printer accepts raw socket connections."""
+        self.ensure_one()
+        try:
+            get_dispatcher(**self._get_dispatcher_config()).check()
+        except RawPrinterError as e:
+            raise UserError(_('Could not connect to %(printer)s: %(error)s',
+                              printer=self.name, error=e)) from e
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Connection Successful'),
+                'message': _('%s is reachable.', self.name),
+                'type': 'success',
+                'sticky': False,
+            },
+        }
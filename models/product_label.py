@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 import base64
+import hashlib
 import io
-from odoo import api, fields, models, _
+from odoo import api, fields, models, tools, _
 from odoo.exceptions import UserError
+from odoo.tools.image import base64_to_image, image_process, image_to_base64
+from odoo.tools.mimetypes import guess_mimetype
 
 try:
     import barcode
@@ -17,6 +20,10 @@ try:
 except ImportError:
     QRCODE_AVAILABLE = False
 
+# Resolution the company logo is downsized to for printing
+LOGO_PRINT_DPI = 300
+MM_PER_INCH = 25.4
+
 
 class ProductLabelTemplate(models.Model):
     _name = 'product.label.template'
@@ -106,6 +113,14 @@ class ProductLabelTemplate(models.Model):
         string='Show Company Logo',
         default=False,
     )
+    logo_width = fields.Float(
+        string='Logo Width (mm)',
+        default=20.0,
+    )
+    logo_height = fields.Float(
+        string='Logo Height (mm)',
+        default=8.0,
+    )
     show_lot_serial = fields.Boolean(
         string='Show Lot/Serial',
         default=False,
@@ -145,6 +160,63 @@ class ProductLabelTemplate(models.Model):
         else:
             return self._generate_barcode(barcode_value, barcode_type)
 
+    def get_logo_image(self, company):
+        """Get the company logo scaled to the label's logo box.
+
+        The logo is downsized once to the physical box at print DPI and
+        cached, so every label of a sheet shares the same small image.
+
+        Args:
+            company: res.company record
+
+        Returns:
+            data URI of the image (PNG, or SVG for vector logos)
+        """
+        if not self.show_company_logo or not company.logo:
+            return False
+        checksum = hashlib.sha1(company.logo).hexdigest()
+        return self._get_scaled_logo(
+            company.id, checksum, self.logo_width, self.logo_height
+        )
+
+    @tools.ormcache('company_id', 'logo_checksum', 'width_mm', 'height_mm')
+    def _get_scaled_logo(self, company_id, logo_checksum, width_mm, height_mm):
+        """Downsize a company logo to a box of the given size.
+
+        The checksum of the logo is part of the cache key so that a new
+        logo is picked up without explicit cache invalidation. SVG logos
+        are vector images and are returned as they are; WEBP logos are
+        converted to PNG so that they are downsized too.
+
+        Args:
+            company_id: res.company id
+            logo_checksum: SHA-1 of the company logo
+            width_mm: logo box width in millimeters
+            height_mm: logo box height in millimeters
+
+        Returns:
+            data URI of the image
+        """
+        company = self.env['res.company'].sudo().browse(company_id)
+        source = base64.b64decode(company.logo)
+        if guess_mimetype(source) == 'image/svg+xml':
+            return 'data:image/svg+xml;base64,%s' % company.logo.decode('ascii')
+
+        size = (
+            max(int(width_mm / MM_PER_INCH * LOGO_PRINT_DPI), 1),
+            max(int(height_mm / MM_PER_INCH * LOGO_PRINT_DPI), 1),
+        )
+        try:
+            if source[:4] == b'RIFF' and source[8:12] == b'WEBP':
+                # image_process returns WEBP sources untouched, convert them first
+                source = base64.b64decode(image_to_base64(base64_to_image(company.logo), 'PNG'))
+            image = image_process(source, size=size, output_format='PNG')
+        except UserError:
+            return False
+        return 'data:%s;base64,%s' % (
+            guess_mimetype(image), base64.b64encode(image).decode('ascii')
+        )
+
     def _generate_barcode(self, value, barcode_type):
         """Generate a 1D barcode image.
 
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+from odoo import api, fields, models
+from odoo.tools import SQL, float_compare
+from odoo.tools.sql import create_unique_index
+
+# Number of products priced at once when looking for changed labels
+PRICE_CHECK_BATCH_SIZE = 1000
+
+
+class ProductLabelPrintHistory(models.Model):
+    _name = 'product.label.print.history'
+    _description = 'Product Label Print History'
+    _order = 'print_date desc, id desc'
+
+    product_id = fields.Many2one(
+        comodel_name='product.product',
+        string='Product',
+        required=True,
+        ondelete='cascade',
+        index=True,
+    )
+    template_id = fields.Many2one(
+        comodel_name='product.label.template',
+        string='Label Template',
+        required=True,
+        ondelete='cascade',
+    )
+    pricelist_id = fields.Many2one(
+        comodel_name='product.pricelist',
+        string='Pricelist',
+        ondelete='cascade',
+    )
+    price = fields.Float(
+        string='Printed Price',
+        digits='Product Price',
+    )
+    barcode = fields.Char(
+        string='Printed Barcode',
+    )
+    print_date = fields.Datetime(
+        string='Last Printed',
+        required=True,
+        default=fields.Datetime.now,
+    )
+
+    def init(self):
+        # One entry per (product, template, pricelist); a missing pricelist
+        # is stored as 0 in the unique key
+        create_unique_index(
+            self.env.cr,
+            'product_label_print_history_unique',
+            self._table,
+            ['product_id', 'template_id', 'COALESCE(pricelist_id, 0)'],
+        )
+
+    @api.model
+    def _record_prints(self, template, pricelist, printed):
+        """Store the price and barcode of freshly printed labels.
+
+        Existing entries are updated in place with a single upsert.
+
+        Args:
+            template: product.label.template record
+            pricelist: product.pricelist record (may be empty)
+            printed: dict mapping product id to a (price, barcode) tuple
+        """
+        if not printed or not template:
+            return
+
+        now = fields.Datetime.now()
+        product_ids = list(printed)
+        self.env.cr.execute(SQL(
+            """
+            INSERT INTO product_label_print_history
+                (product_id, template_id, pricelist_id, price, barcode, print_date,
+                 create_uid, create_date, write_uid, write_date)
+            SELECT t.product_id, %(template)s, %(pricelist)s, t.price, t.barcode, %(now)s,
+                   %(uid)s, %(now)s, %(uid)s, %(now)s
+              FROM unnest(%(products)s::int[], %(prices)s::float8[], %(barcodes)s::varchar[])
+                AS t(product_id, price, barcode)
+            ON CONFLICT (product_id, template_id, COALESCE(pricelist_id, 0))
+            DO UPDATE SET price = EXCLUDED.price,
+                          barcode = EXCLUDED.barcode,
+                          print_date = EXCLUDED.print_date,
+                          write_uid = EXCLUDED.write_uid,
+                          write_date = EXCLUDED.write_date
+            """,
+            template=template.id,
+            pricelist=pricelist.id or None,
+            now=now,
+            uid=self.env.uid,
+            products=product_ids,
+            prices=[printed[product_id][0] for product_id in product_ids],
+            barcodes=[printed[product_id][1] or None for product_id in product_ids],
+        ))
+        self.invalidate_model()
+
+    @api.model
+    def _get_changed_products(self, template, pricelist):
+        """Find the products whose label is out of date.
+
+        A label is out of date when the product's barcode, or the price the
+        wizard would print today, differs from the last printed value for
+        the same template and pricelist. Barcodes and list prices are
+        compared in SQL; pricelist prices are computed in batches.
+
+        Args:
+            template: product.label.template record
+            pricelist: product.pricelist record (may be empty)
+
+        Returns:
+            product.product recordset
+        """
+        if not template:
+            return self.env['product.product']
+
+        self.env['product.product'].flush_model(['barcode', 'active'])
+        self.env['product.template'].flush_model(['list_price'])
+        self.flush_model()
+
+        digits = self.env['decimal.precision'].precision_get('Product Price')
+        self.env.cr.execute(SQL(
+            """
+            SELECT h.product_id,
+                   h.price,
+                   h.barcode IS DISTINCT FROM pp.barcode
+                   OR (%(pricelist)s IS NULL
+                       AND ROUND(COALESCE(pt.list_price, 0)::numeric, %(digits)s)
+                           <> ROUND(COALESCE(h.price, 0)::numeric, %(digits)s))
+              FROM product_label_print_history h
+              JOIN product_product pp ON pp.id = h.product_id
+              JOIN product_template pt ON pt.id = pp.product_tmpl_id
+             WHERE h.template_id = %(template)s
+               AND h.pricelist_id IS NOT DISTINCT FROM %(pricelist)s
+               AND pp.active
+            """,
+            template=template.id,
+            pricelist=pricelist.id or None,
+            digits=digits,
+        ))
+
+        changed_ids = []
+        printed_prices = {}
+        for product_id, price, changed in self.env.cr.fetchall():
+            if changed:
+                changed_ids.append(product_id)
+            elif pricelist:
+                printed_prices[product_id] = price or 0.0
+
+        candidate_ids = list(printed_prices)
+        for start in range(0, len(candidate_ids), PRICE_CHECK_BATCH_SIZE):
+            products = self.env['product.product'].browse(
+                candidate_ids[start:start + PRICE_CHECK_BATCH_SIZE]
+            )
+            prices = pricelist._get_products_price(products, 1.0)
+            changed_ids.extend(
+                product.id for product in products
+                if float_compare(
+                    prices.get(product.id, 0.0),
+                    printed_prices[product.id],
+                    precision_digits=digits,
+                )
+            )
+
+        # Apply access rules on the result
+        return self.env['product.product'].search([('id', 'in', changed_ids)])
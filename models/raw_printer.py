@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""Raw socket (port 9100) printing with pooled connections.
+
+This module has no ORM dependency so that it can be exercised against a
+local TCP stand-in server.
+"""
+import atexit
+import logging
+import select
+import socket
+import threading
+import time
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 9100
+
+
+class RawPrinterError(Exception):
+    """Raised when a print stream could not be delivered to a printer."""
+
+
+class RawPrinterDispatcher:
+    """Send print-ready streams to a raw socket printer.
+
+    Consecutive jobs are written as a single stream over one connection.
+    Failures that happen before any byte reached the printer, such as
+    connection errors, are retried with an exponential backoff; a stream
+    interrupted halfway is never resent, as that would print labels twice.
+
+    Many raw socket printers accept a single connection at a time and only
+    finish a job once the connection closes, so the connection is closed
+    after every stream unless ``idle_timeout`` keeps it open for the next
+    one.
+    """
+
+    def __init__(self, host, port=DEFAULT_PORT, timeout=10.0, retries=3,
+                 backoff=0.5, idle_timeout=0.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.idle_timeout = idle_timeout
+        self._socket = None
+        self._last_used = 0.0
+        self._lock = threading.Lock()
+
+    def configure(self, **options):
+        """Update the connection settings of the dispatcher."""
+        with self._lock:
+            for name, value in options.items():
+                setattr(self, name, value)
+
+    def _connect(self):
+        """Open a new connection to the printer."""
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        return sock
+
+    def _is_alive(self):
+        """Check whether the pooled connection can still be written to.
+
+        Printers do not send anything on a raw port, so a readable socket
+        means the peer has closed or reset the connection.
+        """
+        if self._socket is None:
+            return False
+        if time.monotonic() - self._last_used > self.idle_timeout:
+            return False
+        try:
+            readable, _writable, _errored = select.select([self._socket], [], [], 0)
+            if readable and not self._socket.recv(1, socket.MSG_PEEK):
+                return False
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def _get_connection(self):
+        """Return the pooled connection, reconnecting if it went stale."""
+        if not self._is_alive():
+            self._close()
+            self._socket = self._connect()
+        return self._socket
+
+    def _release(self):
+        """Keep the connection for the next stream, or close it."""
+        if self.idle_timeout > 0:
+            self._last_used = time.monotonic()
+        else:
+            self._close()
+
+    def _close(self):
+        if self._socket is not None:
+            try:
+                self._socket.close()
+            except OSError:
+                pass
+            self._socket = None
+
+    def close(self):
+        """Close the pooled connection."""
+        with self._lock:
+            self._close()
+
+    def check(self):
+        """Check that the printer accepts connections.
+
+        Raises:
+            RawPrinterError: if the printer cannot be reached
+        """
+        with self._lock:
+            try:
+                self._get_connection()
+            except OSError as e:
+                self._close()
+                raise RawPrinterError(
+                    'Could not connect to %s:%s: %s' % (self.host, self.port, e)
+                ) from e
+            self._release()
+
+    def send(self, payloads):
+        """Send print jobs to the printer as one stream.
+
+        The payloads are concatenated as they are, so they must be in a
+        printer language that allows it (ZPL, EPL, ...) or hold a single
+        document.
+
+        Args:
+            payloads: list of bytes, one per print job
+
+        Returns:
+            number of bytes sent
+
+        Raises:
+            RawPrinterError: if the stream could not be delivered
+        """
+        stream = memoryview(b''.join(payloads))
+        if not stream:
+            return 0
+
+        with self._lock:
+            for attempt in range(self.retries + 1):
+                sent = 0
+                try:
+                    sock = self._get_connection()
+                    while sent < len(stream):
+                        sent += sock.send(stream[sent:])
+                except OSError as e:
+                    self._close()
+                    if sent:
+                        raise RawPrinterError(
+                            'Connection to %s:%s lost after %s of %s bytes: %s'
+                            % (self.host, self.port, sent, len(stream), e)
+                        ) from e
+                    if attempt >= self.retries:
+                        raise RawPrinterError(
+                            'Could not send %s job(s) to %s:%s: %s'
+                            % (len(payloads), self.host, self.port, e)
+                        ) from e
+                    delay = self.backoff * (2 ** attempt)
+                    _logger.warning(
+                        "Printing to %s:%s failed (%s), retrying in %.1fs",
+                        self.host, self.port, e, delay,
+                    )
+                    time.sleep(delay)
+                else:
+                    self._release()
+                    return sent
+
+
+_dispatchers = {}
+_dispatchers_lock = threading.Lock()
+
+
+def get_dispatcher(host, port=DEFAULT_PORT, **options):
+    """Return the shared dispatcher of a printer, creating it if needed.
+
+    Dispatchers are pooled per (host, port) for the lifetime of the worker
+    so that jobs on the same printer are serialized and can reuse its
+    connection.
+    """
+    key = (host, port)
+    with _dispatchers_lock:
+        dispatcher = _dispatchers.get(key)
+        if dispatcher is None:
+            return _dispatchers.setdefault(key, RawPrinterDispatcher(host, port, **options))
+    dispatcher.configure(**options)
+    return dispatcher
+
+
+def close_dispatchers():
+    """Close every pooled printer connection."""
+    with _dispatchers_lock:
+        for dispatcher in _dispatchers.values():
+            dispatcher.close()
+        _dispatchers.clear()
+
+
+atexit.register(close_dispatchers)
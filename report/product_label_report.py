@@ -55,63 +55,19 @@ class ProductLabelReport(models.AbstractModel):
             for wizard in docs:
                 _logger.info("Wizard %s: product_ids=%s, line_ids=%s",
                            wizard.id, wizard.product_ids.ids, len(wizard.line_ids))
-
-                pricelist = wizard.pricelist_id
-
-                # Try line_ids first
-                if wizard.line_ids:
-                    for line in wizard.line_ids:
-                        if line.quantity > 0:
-                            product = line.product_id
-                            price = product.list_price
-                            if pricelist:
-                                price = pricelist._get_product_price(product, 1.0)
-
-                            barcode_image = False
-                            if product.barcode and template:
-                                barcode_image = template.generate_barcode_image(
-                                    product.barcode
-                                )
-
-                            for _ in range(line.quantity):
-                                lines_data.append({
-                                    'product': product,
-                                    'barcode': product.barcode or product.default_code or '',
-                                    'barcode_image': barcode_image,
-                                    'price': price,
-                                    'lot': line.lot_id.name if line.lot_id else '',
-                                })
-                # Fallback to product_ids
-                elif wizard.product_ids:
-                    _logger.info("Using product_ids fallback")
-                    quantity = wizard.quantity_per_product or 1
-                    for product in wizard.product_ids:
-                        price = product.list_price
-                        if pricelist:
-                            price = pricelist._get_product_price(product, 1.0)
-
-                        barcode_image = False
-                        if product.barcode and template:
-                            barcode_image = template.generate_barcode_image(
-                                product.barcode
-                            )
-
-                        for _ in range(quantity):
-                            lines_data.append({
-                                'product': product,
-                                'barcode': product.barcode or product.default_code or '',
-                                'barcode_image': barcode_image,
-                                'price': price,
-                                'lot': '',
-                            })
+                lines_data.extend(wizard._get_label_lines_data())
 
         _logger.info("Final lines_data count: %s", len(lines_data))
 
+        # Scaled once and referenced once per document by the template
+        logo_image = template.get_logo_image(self.env.company) if template else False
+
         return {
             'doc_ids': docids,
             'doc_model': 'product.label.wizard',
             'docs': docs,
             'template': template,
             'lines_data': lines_data,
+            'logo_image': logo_image,
             'data': data,
         }
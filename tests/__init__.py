@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+from . import test_label_export
+from . import test_label_logo
+from . import test_label_performance
+from . import test_print_history
+from . import test_raw_printer
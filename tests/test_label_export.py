@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+import csv
+import io
+import json
+
+from odoo.tests import HttpCase, TransactionCase, new_test_user, tagged
+
+from odoo.addons.barcode_scanner_label.controllers.main import iter_export_chunks
+from odoo.addons.barcode_scanner_label.wizard.product_label_wizard import EXPORT_FIELDS
+
+
+@tagged('post_install', '-at_install')
+class TestLabelExport(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.template = cls.env.ref('barcode_scanner_label.product_label_template_default')
+        cls.product_a = cls.env['product.product'].create({
+            'name': 'Export Product A',
+            'default_code': 'EXP-A',
+            'barcode': '2000000000008',
+            'list_price': 12.5,
+        })
+        cls.product_b = cls.env['product.product'].create({
+            'name': 'Export Product B',
+            'default_code': 'EXP-B',
+            'list_price': 4.0,
+        })
+        cls.lot = cls.env['stock.lot'].create({
+            'name': 'LOT-EXP-A',
+            'product_id': cls.product_a.id,
+            'company_id': cls.env.company.id,
+        })
+        cls.pricelist = cls.env['product.pricelist'].create({
+            'name': 'Export Pricelist',
+            'item_ids': [(0, 0, {
+                'compute_price': 'percentage',
+                'percent_price': 10.0,
+            })],
+        })
+
+    def _row(self, product, price, currency, quantity, lot=''):
+        return {
+            'product': product.display_name,
+            'default_code': product.default_code or '',
+            'barcode': product.barcode or product.default_code or '',
+            'symbology': self.template.barcode_type,
+            'price': price,
+            'currency': currency.name,
+            'lot': lot,
+            'expiry': '',
+            'quantity': quantity,
+        }
+
+    def test_export_rows_from_lines(self):
+        """Lines keep their lot and quantity; empty lines are skipped."""
+        wizard = self.env['product.label.wizard'].create({
+            'template_id': self.template.id,
+            'line_ids': [
+                (0, 0, {'product_id': self.product_a.id, 'quantity': 3, 'lot_id': self.lot.id}),
+                (0, 0, {'product_id': self.product_b.id, 'quantity': 0}),
+                (0, 0, {'product_id': self.product_b.id, 'quantity': 2}),
+            ],
+        })
+        rows = list(wizard._iter_export_rows(batch_size=1))
+        self.assertEqual(rows, [
+            self._row(self.product_a, 12.5, self.product_a.currency_id, 3, 'LOT-EXP-A'),
+            self._row(self.product_b, 4.0, self.product_b.currency_id, 2),
+        ])
+        self.assertEqual([list(row) for row in rows], [EXPORT_FIELDS] * 2)
+
+    def test_export_rows_from_products(self):
+        """Without lines, products are exported with the pricelist price."""
+        wizard = self.env['product.label.wizard'].create({
+            'template_id': self.template.id,
+            'pricelist_id': self.pricelist.id,
+            'product_ids': [(6, 0, (self.product_a | self.product_b).ids)],
+            'quantity_per_product': 4,
+        })
+        currency = self.pricelist.currency_id
+        rows = list(wizard._iter_export_rows())
+        self.assertEqual(rows, [
+            self._row(self.product_a, currency.round(11.25), currency, 4),
+            self._row(self.product_b, currency.round(3.6), currency, 4),
+        ])
+
+    def test_export_chunks(self):
+        """CSV and JSON output is framed correctly across chunks."""
+        rows = [
+            self._row(product, 1.0, self.product_a.currency_id, quantity)
+            for product, quantity in [
+                (self.product_a, 1), (self.product_b, 2), (self.product_a, 3),
+            ]
+        ]
+
+        chunks = list(iter_export_chunks(rows, 'csv', chunk_size=2))
+        self.assertEqual(len(chunks), 2)
+        reader = csv.DictReader(io.StringIO(b''.join(chunks).decode('utf-8')))
+        self.assertEqual(reader.fieldnames, EXPORT_FIELDS)
+        self.assertEqual([int(row['quantity']) for row in reader], [1, 2, 3])
+
+        chunks = list(iter_export_chunks(rows, 'json', chunk_size=2))
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(json.loads(b''.join(chunks)), rows)
+
+        self.assertEqual(b''.join(iter_export_chunks([], 'json')), b'[]')
+
+        # No trailing empty chunk when the rows fill the last chunk exactly
+        chunks = list(iter_export_chunks(rows, 'csv', chunk_size=3))
+        self.assertEqual(len(chunks), 1)
+        self.assertTrue(all(chunks))
+
+
+@tagged('post_install', '-at_install')
+class TestLabelExportController(HttpCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = new_test_user(cls.env, login='label_export_user', groups='base.group_user')
+        cls.other_user = new_test_user(cls.env, login='label_export_other', groups='base.group_user')
+        cls.product = cls.env['product.product'].create({
+            'name': 'Export Route Product',
+            'default_code': 'EXP-R',
+            'barcode': '2000000000015',
+            'list_price': 7.5,
+        })
+        cls.wizard = cls.env['product.label.wizard'].with_user(cls.user).create({
+            'template_id': cls.env.ref('barcode_scanner_label.product_label_template_default').id,
+            'line_ids': [(0, 0, {'product_id': cls.product.id, 'quantity': 5})],
+        })
+
+    def _url(self, export_format):
+        return '/barcode_scanner_label/export/%s/%s' % (self.wizard.id, export_format)
+
+    def test_export_csv(self):
+        self.authenticate('label_export_user', 'label_export_user')
+        response = self.url_open(self._url('csv'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Type'], 'text/csv;charset=utf-8')
+        self.assertIn('product_labels.csv', response.headers['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(response.content.decode('utf-8'))))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['product'], self.product.display_name)
+        self.assertEqual(rows[0]['barcode'], '2000000000015')
+        self.assertEqual(rows[0]['quantity'], '5')
+
+    def test_export_json(self):
+        self.authenticate('label_export_user', 'label_export_user')
+        response = self.url_open(self._url('json'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Type'], 'application/json;charset=utf-8')
+        self.assertEqual([row['quantity'] for row in response.json()], [5])
+
+    def test_export_unknown_format(self):
+        self.authenticate('label_export_user', 'label_export_user')
+        self.assertEqual(self.url_open(self._url('xlsx')).status_code, 404)
+
+    def test_export_other_users_wizard(self):
+        self.authenticate('label_export_other', 'label_export_other')
+        self.assertEqual(self.url_open(self._url('csv')).status_code, 403)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import base64
+import io
+
+from PIL import Image
+
+from odoo.tests import TransactionCase, tagged
+
+from odoo.addons.barcode_scanner_label.models.product_label import (
+    LOGO_PRINT_DPI,
+    MM_PER_INCH,
+)
+
+SVG_LOGO = b'<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10"><rect width="10" height="10"/></svg>'
+
+
+def make_logo(width, height, image_format='PNG'):
+    """Build a base64 encoded image of the given size."""
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), 'red').save(buffer, format=image_format)
+    return base64.b64encode(buffer.getvalue())
+
+
+@tagged('post_install', '-at_install')
+class TestLabelLogo(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env.company
+        cls.template = cls.env.ref('barcode_scanner_label.product_label_template_large_qr')
+        cls.box = (
+            int(cls.template.logo_width / MM_PER_INCH * LOGO_PRINT_DPI),
+            int(cls.template.logo_height / MM_PER_INCH * LOGO_PRINT_DPI),
+        )
+
+    def _decode(self, data_uri):
+        prefix = 'data:image/png;base64,'
+        self.assertTrue(data_uri.startswith(prefix))
+        return Image.open(io.BytesIO(base64.b64decode(data_uri[len(prefix):])))
+
+    def test_logo_is_downscaled_png(self):
+        self.company.logo = make_logo(1600, 400)
+        image = self._decode(self.template.get_logo_image(self.company))
+        self.assertEqual(image.format, 'PNG')
+        self.assertLessEqual(image.width, self.box[0])
+        self.assertLessEqual(image.height, self.box[1])
+        self.assertAlmostEqual(image.width / image.height, 4, delta=0.1)
+
+    def test_logo_cache_follows_company_logo(self):
+        self.company.logo = make_logo(1600, 400)
+        first = self.template.get_logo_image(self.company)
+        self.assertIs(self.template.get_logo_image(self.company), first)
+
+        self.company.logo = make_logo(800, 800)
+        second = self.template.get_logo_image(self.company)
+        self.assertNotEqual(second, first)
+        image = self._decode(second)
+        self.assertEqual(image.width, image.height)
+
+    def test_logo_disabled(self):
+        self.company.logo = make_logo(100, 100)
+        template = self.env.ref('barcode_scanner_label.product_label_template_default')
+        self.assertFalse(template.get_logo_image(self.company))
+
+    def test_svg_logo_keeps_its_mimetype(self):
+        self.company.logo = base64.b64encode(SVG_LOGO)
+        self.assertEqual(
+            self.template.get_logo_image(self.company),
+            'data:image/svg+xml;base64,%s' % base64.b64encode(SVG_LOGO).decode('ascii'),
+        )
+
+    def test_webp_logo_is_downscaled_png(self):
+        self.company.logo = make_logo(1600, 400, 'WEBP')
+        image = self._decode(self.template.get_logo_image(self.company))
+        self.assertEqual(image.format, 'PNG')
+        self.assertLessEqual(image.width, self.box[0])
+        self.assertLessEqual(image.height, self.box[1])
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+import tracemalloc
+
+from odoo.tests import TransactionCase, tagged
+
+# Number of products labelled by each scenario
+SCALES = (10, 100, 500)
+
+# SQL query budget of each entry point, the same at every scale so that a
+# query issued per product or per line (N+1) fails the test
+QUERY_BUDGETS = {
+    'default_get': 20,
+    'onchange_products': 10,
+    'print_labels': 30,
+    'report_values': 30,
+}
+
+# tracemalloc peak budget of each entry point, as (fixed bytes, bytes per
+# label). Opening the wizard and populating lines only handle ids, so their
+# budget barely grows; printing holds one barcode image per product and one
+# data dictionary per label.
+KIB = 1024
+MIB = 1024 * KIB
+MEMORY_BUDGETS = {
+    'default_get': (2 * MIB, 2 * KIB),
+    'onchange_products': (2 * MIB, 2 * KIB),
+    'print_labels': (4 * MIB, 16 * KIB),
+    'report_values': (4 * MIB, 16 * KIB),
+}
+
+
+def ean13(number):
+    """Build a valid EAN-13 barcode from a sequence number."""
+    digits = '20%010d' % number
+    checksum = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(digits))
+    return digits + str((10 - checksum % 10) % 10)
+
+
+@tagged('post_install', '-at_install', 'label_performance')
+class TestLabelPerformance(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.template = cls.env.ref('barcode_scanner_label.product_label_template_default')
+        cls.partner = cls.env['res.partner'].create({'name': 'Label Customer'})
+        cls.products = cls.env['product.product'].create([{
+            'name': 'Label Product %s' % i,
+            'default_code': 'LBL%05d' % i,
+            'barcode': ean13(i),
+            'list_price': 10.0 + i,
+        } for i in range(max(SCALES))])
+        cls.pricelist = cls.env['product.pricelist'].create({
+            'name': 'Label Pricelist',
+            'item_ids': [(0, 0, {
+                'compute_price': 'percentage',
+                'percent_price': 10.0,
+            })],
+        })
+        cls.lots = cls.env['stock.lot'].create([{
+            'name': 'LOT-%s' % product.default_code,
+            'product_id': product.id,
+            'company_id': cls.env.company.id,
+        } for product in cls.products])
+
+    def _products(self, scale):
+        return self.products[:scale]
+
+    def _create_wizard(self, products, lots=None, pricelist=None):
+        lots = lots or self.env['stock.lot']
+        lot_by_product = {lot.product_id.id: lot.id for lot in lots}
+        return self.env['product.label.wizard'].create({
+            'template_id': self.template.id,
+            'pricelist_id': pricelist.id if pricelist else False,
+            'product_ids': [(6, 0, products.ids)],
+            'line_ids': [(0, 0, {
+                'product_id': product.id,
+                'quantity': 2,
+                'lot_id': lot_by_product.get(product.id, False),
+            }) for product in products],
+        })
+
+    def _sources(self, products):
+        """Create the records the wizard can be opened from.
+
+        Returns:
+            list of (active_model, records) tuples
+        """
+        sources = [
+            ('product.product', products),
+            ('product.template', products.product_tmpl_id),
+        ]
+        if 'sale.order' in self.env:
+            sources.append(('sale.order', self.env['sale.order'].create({
+                'partner_id': self.partner.id,
+                'order_line': [(0, 0, {
+                    'product_id': product.id,
+                    'product_uom_qty': 1,
+                }) for product in products],
+            })))
+        if 'purchase.order' in self.env:
+            sources.append(('purchase.order', self.env['purchase.order'].create({
+                'partner_id': self.partner.id,
+                'order_line': [(0, 0, {
+                    'product_id': product.id,
+                    'product_qty': 1,
+                }) for product in products],
+            })))
+        picking_type = self.env.ref('stock.picking_type_out')
+        location = picking_type.default_location_src_id
+        location_dest = self.env.ref('stock.stock_location_customers')
+        sources.append(('stock.picking', self.env['stock.picking'].create({
+            'partner_id': self.partner.id,
+            'picking_type_id': picking_type.id,
+            'location_id': location.id,
+            'location_dest_id': location_dest.id,
+            'move_ids': [(0, 0, {
+                'name': product.name,
+                'product_id': product.id,
+                'product_uom_qty': 1,
+                'product_uom': product.uom_id.id,
+                'location_id': location.id,
+                'location_dest_id': location_dest.id,
+            }) for product in products],
+        })))
+        # Invoices need a sales journal, which only exists with a chart of accounts
+        if 'account.move' in self.env and self.env['account.journal'].search([
+            ('type', '=', 'sale'), ('company_id', '=', self.env.company.id),
+        ], limit=1):
+            sources.append(('account.move', self.env['account.move'].create({
+                'move_type': 'out_invoice',
+                'partner_id': self.partner.id,
+                'invoice_line_ids': [(0, 0, {
+                    'product_id': product.id,
+                    'quantity': 1,
+                    'price_unit': product.list_price,
+                }) for product in products],
+            })))
+        return sources
+
+    def _assert_peak_memory(self, entry_point, func, labels, msg):
+        """Run func and check its tracemalloc peak against its budget."""
+        tracemalloc.start()
+        try:
+            func()
+            _current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        base, per_label = MEMORY_BUDGETS[entry_point]
+        budget = base + per_label * labels
+        self.assertLessEqual(
+            peak, budget,
+            "%s: peak memory %d exceeds budget %d" % (msg, peak, budget),
+        )
+
+    def test_default_get(self):
+        """Opening the wizard costs the same number of queries at any scale."""
+        Wizard = self.env['product.label.wizard']
+        for scale in SCALES:
+            products = self._products(scale)
+            for active_model, records in self._sources(products):
+                with self.subTest(scale=scale, active_model=active_model):
+                    wizard_env = Wizard.with_context(
+                        active_model=active_model, active_ids=records.ids,
+                    )
+                    self.env.invalidate_all()
+                    with self.assertQueryCount(QUERY_BUDGETS['default_get']):
+                        res = wizard_env.default_get(['product_ids', 'line_ids'])
+                    self.assertEqual(len(res['line_ids']), scale)
+                    self.env.invalidate_all()
+                    self._assert_peak_memory(
+                        'default_get',
+                        lambda: wizard_env.default_get(['product_ids', 'line_ids']),
+                        scale, 'default_get(%s, %s)' % (active_model, scale),
+                    )
+
+    def test_onchange_products(self):
+        """Populating lines from products does not query per product."""
+        for scale in SCALES:
+            with self.subTest(scale=scale):
+                products = self._products(scale)
+                wizard = self.env['product.label.wizard'].new({
+                    'template_id': self.template.id,
+                    'product_ids': [(6, 0, products.ids)],
+                    'quantity_per_product': 3,
+                })
+                with self.assertQueryCount(QUERY_BUDGETS['onchange_products']):
+                    wizard._onchange_products()
+                    wizard.line_ids.mapped('barcode')
+                self.assertEqual(len(wizard.line_ids), scale)
+                self._assert_peak_memory(
+                    'onchange_products', wizard._onchange_products, scale,
+                    '_onchange_products(%s)' % scale,
+                )
+
+    def test_print_labels(self):
+        """Printing labels costs the same number of queries at any scale."""
+        for scale in SCALES:
+            products = self._products(scale)
+            lots = self.lots[:scale]
+            for pricelist in (None, self.pricelist):
+                with self.subTest(scale=scale, pricelist=bool(pricelist)):
+                    wizard = self._create_wizard(products, lots, pricelist)
+                    self.env.invalidate_all()
+                    with self.assertQueryCount(QUERY_BUDGETS['print_labels']):
+                        action = wizard.action_print_labels()
+                    self.assertEqual(len(action['data']['lines_data']), scale * 2)
+                    self.env.invalidate_all()
+                    self._assert_peak_memory(
+                        'print_labels', wizard.action_print_labels, scale * 2,
+                        'action_print_labels(%s)' % scale,
+                    )
+
+    def test_report_values(self):
+        """Rebuilding the report data from the wizard does not query per line."""
+        Report = self.env['report.barcode_scanner_label.report_product_label']
+        for scale in SCALES:
+            products = self._products(scale)
+            lots = self.lots[:scale]
+            for pricelist in (None, self.pricelist):
+                with self.subTest(scale=scale, pricelist=bool(pricelist)):
+                    wizard = self._create_wizard(products, lots, pricelist)
+                    data = {'template_id': self.template.id}
+                    self.env.invalidate_all()
+                    with self.assertQueryCount(QUERY_BUDGETS['report_values']):
+                        values = Report._get_report_values(wizard.ids, data=data)
+                    self.assertEqual(len(values['lines_data']), scale * 2)
+                    self.env.invalidate_all()
+                    self._assert_peak_memory(
+                        'report_values',
+                        lambda: Report._get_report_values(wizard.ids, data=data),
+                        scale * 2, '_get_report_values(%s)' % scale,
+                    )
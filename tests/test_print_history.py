@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+from odoo.tests import Form, TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestLabelPrintHistory(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.History = cls.env['product.label.print.history']
+        cls.template = cls.env.ref('barcode_scanner_label.product_label_template_default')
+        cls.no_pricelist = cls.env['product.pricelist']
+        cls.pricelist = cls.env['product.pricelist'].create({
+            'name': 'History Pricelist',
+            'item_ids': [(0, 0, {
+                'compute_price': 'percentage',
+                'percent_price': 10.0,
+            })],
+        })
+        cls.product_1, cls.product_2, cls.product_3 = cls.products = (
+            cls.env['product.product'].create([{
+                'name': 'History Product %s' % i,
+                'barcode': 'HIST-%s' % i,
+                'list_price': 10.0 * i,
+            } for i in (1, 2, 3)])
+        )
+
+    def _print(self, pricelist):
+        """Record the labels of every product as printed today."""
+        if pricelist:
+            prices = pricelist._get_products_price(self.products, 1.0)
+        else:
+            prices = {product.id: product.list_price for product in self.products}
+        self.History._record_prints(self.template, pricelist, {
+            product.id: (prices[product.id], product.barcode)
+            for product in self.products
+        })
+
+    def _history_count(self):
+        return self.History.search_count([
+            ('template_id', '=', self.template.id),
+            ('product_id', 'in', self.products.ids),
+        ])
+
+    def _changed(self, pricelist):
+        return self.History._get_changed_products(self.template, pricelist)
+
+    def test_changed_without_pricelist(self):
+        self._print(self.no_pricelist)
+        self.assertFalse(self._changed(self.no_pricelist))
+
+        # Below the price precision
+        self.product_1.list_price += 0.001
+        self.assertFalse(self._changed(self.no_pricelist))
+
+        self.product_1.list_price = 99.0
+        self.assertEqual(self._changed(self.no_pricelist), self.product_1)
+
+        self.product_2.barcode = 'HIST-NEW'
+        self.assertEqual(self._changed(self.no_pricelist), self.product_1 | self.product_2)
+
+        self.product_3.barcode = False
+        self.assertEqual(self._changed(self.no_pricelist), self.products)
+
+        # Reprinting updates the existing entries
+        self._print(self.no_pricelist)
+        self.assertFalse(self._changed(self.no_pricelist))
+        self.assertEqual(self._history_count(), 3)
+
+    def test_changed_with_pricelist(self):
+        self._print(self.pricelist)
+        self._print(self.no_pricelist)
+        self.assertFalse(self._changed(self.pricelist))
+        self.assertEqual(self._history_count(), 6)
+
+        self.product_1.list_price = 99.0
+        self.assertEqual(self._changed(self.pricelist), self.product_1)
+
+        self.product_2.barcode = 'HIST-NEW'
+        self.assertEqual(self._changed(self.pricelist), self.product_1 | self.product_2)
+
+        self.pricelist.item_ids.percent_price = 20.0
+        self.assertEqual(self._changed(self.pricelist), self.products)
+
+        # A rule change does not affect labels printed without the pricelist
+        self.assertEqual(self._changed(self.no_pricelist), self.product_1 | self.product_2)
+
+        self._print(self.pricelist)
+        self.assertFalse(self._changed(self.pricelist))
+        self.assertEqual(self._history_count(), 6)
+
+    def test_unprinted_template(self):
+        self._print(self.no_pricelist)
+        other_template = self.env.ref('barcode_scanner_label.product_label_template_price_tag')
+        self.assertFalse(self.History._get_changed_products(other_template, self.no_pricelist))
+
+    def _wizard(self, **values):
+        return self.env['product.label.wizard'].create(dict({
+            'template_id': self.template.id,
+            'product_ids': [(6, 0, self.products.ids)],
+            'line_ids': [(0, 0, {
+                'product_id': product.id,
+                'quantity': 1,
+            }) for product in self.products],
+        }, **values))
+
+    def test_preview_does_not_record(self):
+        self._wizard().action_preview()
+        self.assertEqual(self._history_count(), 0)
+
+    def test_print_records(self):
+        self._wizard(pricelist_id=self.pricelist.id).action_print_labels()
+        self.assertEqual(self._history_count(), 3)
+        self.assertFalse(self._changed(self.pricelist))
+
+    def test_reprint_changed_flow(self):
+        self._wizard().action_print_labels()
+        self.product_2.list_price = 99.0
+
+        # The form runs _onchange_print_mode, then _onchange_products
+        with Form(self.env['product.label.wizard']) as wizard_form:
+            wizard_form.template_id = self.template
+            wizard_form.quantity_per_product = 2
+            wizard_form.print_mode = 'changed'
+        wizard = wizard_form.record
+        self.assertEqual(wizard.product_ids, self.product_2)
+        self.assertEqual(wizard.line_ids.product_id, self.product_2)
+        self.assertEqual(wizard.line_ids.quantity, 2)
+
+        action = wizard.action_print_labels()
+        self.assertEqual(
+            [label['price'] for label in action['data']['lines_data']],
+            [99.0, 99.0],
+        )
+        self.assertFalse(self._changed(self.no_pricelist))
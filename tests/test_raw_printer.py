@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+import socket
+import struct
+import threading
+import time
+from unittest.mock import patch
+
+from odoo.exceptions import UserError
+from odoo.tests.common import BaseCase, TransactionCase, tagged
+
+from odoo.addons.barcode_scanner_label.models import raw_printer
+from odoo.addons.barcode_scanner_label.models.raw_printer import (
+    RawPrinterDispatcher,
+    RawPrinterError,
+)
+
+
+class StandInPrinter:
+    """Local TCP server recording the stream of every connection."""
+
+    def __init__(self, reset_after=None):
+        self.reset_after = reset_after
+        self.server = socket.create_server(('127.0.0.1', 0))
+        self.port = self.server.getsockname()[1]
+        self.connections = []
+        self.streams = []
+        self.finished = []
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _address = self.server.accept()
+            except OSError:
+                return
+            stream = bytearray()
+            finished = threading.Event()
+            self.connections.append(conn)
+            self.streams.append(stream)
+            self.finished.append(finished)
+            threading.Thread(
+                target=self._read, args=(conn, stream, finished), daemon=True,
+            ).start()
+
+    def _read(self, conn, stream, finished):
+        try:
+            while True:
+                data = conn.recv(65536)
+                if not data:
+                    break
+                stream.extend(data)
+                if self.reset_after and len(stream) >= self.reset_after:
+                    # Abort the connection with a reset, as a crashed printer would
+                    conn.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+                    conn.close()
+                    break
+        except OSError:
+            pass
+        finished.set()
+
+    def wait_for(self, condition, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                raise AssertionError('Timed out waiting for the stand-in printer')
+            time.sleep(0.01)
+
+    def close(self):
+        self.server.close()
+        for conn in self.connections:
+            conn.close()
+
+
+@tagged('post_install', '-at_install')
+class TestRawPrinterDispatcher(BaseCase):
+
+    def _printer(self, **kwargs):
+        printer = StandInPrinter(**kwargs)
+        self.addCleanup(printer.close)
+        return printer
+
+    def _dispatcher(self, port, **options):
+        dispatcher = RawPrinterDispatcher('127.0.0.1', port, timeout=2.0, **options)
+        self.addCleanup(dispatcher.close)
+        return dispatcher
+
+    def test_jobs_share_one_stream_and_connection(self):
+        printer = self._printer()
+        dispatcher = self._dispatcher(printer.port, idle_timeout=60.0)
+
+        self.assertEqual(dispatcher.send([b'JOB1', b'JOB2']), 8)
+        dispatcher.send([b'JOB3'])
+        printer.wait_for(lambda: printer.streams and len(printer.streams[0]) == 12)
+        self.assertEqual(len(printer.connections), 1)
+        self.assertEqual(bytes(printer.streams[0]), b'JOB1JOB2JOB3')
+
+    def test_connection_closed_after_stream_by_default(self):
+        printer = self._printer()
+        dispatcher = self._dispatcher(printer.port)
+
+        dispatcher.send([b'JOB1'])
+        printer.wait_for(lambda: printer.finished and printer.finished[0].is_set())
+        dispatcher.send([b'JOB2'])
+        printer.wait_for(lambda: len(printer.finished) == 2 and printer.finished[1].is_set())
+        self.assertEqual([bytes(stream) for stream in printer.streams], [b'JOB1', b'JOB2'])
+
+    def test_reconnect_after_peer_close(self):
+        printer = self._printer()
+        dispatcher = self._dispatcher(printer.port, idle_timeout=60.0)
+
+        dispatcher.send([b'JOB1'])
+        printer.wait_for(lambda: printer.streams and printer.streams[0] == b'JOB1')
+        printer.connections[0].shutdown(socket.SHUT_RDWR)
+        printer.wait_for(lambda: printer.finished[0].is_set())
+
+        dispatcher.send([b'JOB2'])
+        printer.wait_for(lambda: len(printer.streams) == 2 and printer.streams[1] == b'JOB2')
+        self.assertEqual(len(printer.connections), 2)
+
+    def test_retry_with_backoff(self):
+        # Reserve a free port and release it so that connections are refused
+        server = socket.create_server(('127.0.0.1', 0))
+        port = server.getsockname()[1]
+        server.close()
+        dispatcher = self._dispatcher(port, retries=3, backoff=0.5)
+
+        with patch.object(raw_printer.time, 'sleep') as sleep:
+            with self.assertRaises(RawPrinterError):
+                dispatcher.send([b'JOB1'])
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [0.5, 1.0, 2.0])
+
+    def test_interrupted_stream_is_not_resent(self):
+        printer = self._printer(reset_after=1)
+        dispatcher = self._dispatcher(printer.port, retries=3, backoff=0.5)
+
+        with patch.object(raw_printer.time, 'sleep') as sleep:
+            with self.assertRaises(RawPrinterError):
+                dispatcher.send([b'x' * (64 * 1024 * 1024)])
+        sleep.assert_not_called()
+        self.assertEqual(len(printer.connections), 1)
+
+
+@tagged('post_install', '-at_install')
+class TestSendToPrinter(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.template = cls.env.ref('barcode_scanner_label.product_label_template_default')
+        cls.product = cls.env['product.product'].create({
+            'name': 'Printed Product',
+            'barcode': '2000000000015',
+            'list_price': 12.0,
+        })
+
+    def _wizard(self, port):
+        printer = self.env['label.printer'].create({
+            'name': 'Stand-in Printer',
+            'host': '127.0.0.1',
+            'port': port,
+            'timeout': 2.0,
+            'retries': 0,
+        })
+        return self.env['product.label.wizard'].create({
+            'template_id': self.template.id,
+            'printer_id': printer.id,
+            'product_ids': [(6, 0, self.product.ids)],
+            'line_ids': [(0, 0, {'product_id': self.product.id, 'quantity': 1})],
+        })
+
+    def _history(self):
+        return self.env['product.label.print.history'].search([
+            ('product_id', '=', self.product.id),
+            ('template_id', '=', self.template.id),
+        ])
+
+    def test_send_delivers_labels_and_records_history(self):
+        printer = StandInPrinter()
+        self.addCleanup(printer.close)
+        wizard = self._wizard(printer.port)
+
+        wizard.action_send_to_printer()
+        printer.wait_for(lambda: printer.finished and printer.finished[0].is_set())
+        self.assertTrue(printer.streams[0])
+        self.assertEqual(self._history().price, 12.0)
+
+    def test_send_failure_raises_without_history(self):
+        # Reserve a free port and release it so that connections are refused
+        server = socket.create_server(('127.0.0.1', 0))
+        port = server.getsockname()[1]
+        server.close()
+        wizard = self._wizard(port)
+
+        with self.assertRaises(UserError):
+            wizard.action_send_to_printer()
+        self.assertFalse(self._history())
@@ -1,5 +1,22 @@
 # -*- coding: utf-8 -*-
 from odoo import api, fields, models, _
+from odoo.exceptions import UserError
+
+# Number of label lines resolved, priced and prefetched per batch
+LINE_BATCH_SIZE = 1000
+
+# Column order of the label data export
+EXPORT_FIELDS = [
+    'product',
+    'default_code',
+    'barcode',
+    'symbology',
+    'price',
+    'currency',
+    'lot',
+    'expiry',
+    'quantity',
+]
 
 
 class ProductLabelWizard(models.TransientModel):
@@ -31,6 +48,23 @@ class ProductLabelWizard(models.TransientModel):
         default=1,
         help="Number of labels to print per product",
     )
+    printer_id = fields.Many2one(
+        comodel_name='label.printer',
+        string='Printer',
+        help="Network printer to send the labels to directly",
+    )
+    print_mode = fields.Selection(
+        selection=[
+            ('selected', 'Selected Products'),
+            ('changed', 'Changed Since Last Print'),
+        ],
+        string='Print Mode',
+        default='selected',
+        required=True,
+        help="Changed Since Last Print loads only the products whose price or "
+             "barcode differs from the last label printed with this template "
+             "and pricelist",
+    )
 
     @api.onchange('product_ids', 'quantity_per_product')
     def _onchange_products(self):
@@ -43,6 +77,17 @@ class ProductLabelWizard(models.TransientModel):
             }))
         self.line_ids = lines
 
+    @api.onchange('print_mode', 'template_id', 'pricelist_id')
+    def _onchange_print_mode(self):
+        """Load the products whose labels are out of date."""
+        if self.print_mode != 'changed':
+            return
+        products = self.env['product.label.print.history']._get_changed_products(
+            self.template_id, self.pricelist_id
+        )
+        # Lines are rebuilt by _onchange_products
+        self.product_ids = products
+
     @api.model
     def default_get(self, fields_list):
         """Set default products from context."""
@@ -84,13 +129,14 @@ class ProductLabelWizard(models.TransientModel):
 
         return res
 
-    def _prepare_label_data(self, product, quantity, lot_name=''):
+    def _prepare_label_data(self, product, quantity, lot_name='', price=None):
         """Prepare label data for a single product.
 
         Args:
             product: product.product record
             quantity: number of labels to print
             lot_name: optional lot/serial name
+            price: precomputed label price (optional)
 
         Returns:
             list of label data dictionaries
@@ -98,9 +144,10 @@ class ProductLabelWizard(models.TransientModel):
         labels = []
 
         # Get price
-        price = product.list_price
-        if self.pricelist_id:
-            price = self.pricelist_id._get_product_price(product, 1.0)
+        if price is None:
+            price = product.list_price
+            if self.pricelist_id:
+                price = self.pricelist_id._get_product_price(product, 1.0)
 
         # Generate barcode image
         barcode_image = False
@@ -120,38 +167,204 @@ class ProductLabelWizard(models.TransientModel):
 
         return labels
 
-    def action_print_labels(self):
-        """Generate and print labels."""
-        self.ensure_one()
+    def _iter_label_line_batches(self, batch_size=LINE_BATCH_SIZE):
+        """Resolve the wizard into label lines, one batch at a time.
 
-        # Prepare data for the report
-        lines_data = []
+        Lines from ``line_ids`` take precedence; when there are none the
+        wizard falls back to ``product_ids`` with ``quantity_per_product``.
+        Each batch is browsed separately so that prefetching stays bounded
+        by ``batch_size`` whatever the size of the wizard.
 
-        # Try to use line_ids first
+        Args:
+            batch_size: number of lines resolved per batch
+
+        Yields:
+            lists of (product, quantity, lot) tuples
+        """
+        self.ensure_one()
         if self.line_ids:
-            for line in self.line_ids:
-                if line.quantity > 0:
-                    lot_name = line.lot_id.name if line.lot_id else ''
-                    lines_data.extend(
-                        self._prepare_label_data(line.product_id, line.quantity, lot_name)
-                    )
-        # Fallback: use product_ids directly if line_ids is empty
+            line_ids = self.line_ids.ids
+            for start in range(0, len(line_ids), batch_size):
+                lines = self.env['product.label.line'].browse(
+                    line_ids[start:start + batch_size]
+                )
+                yield [
+                    (line.product_id, line.quantity, line.lot_id)
+                    for line in lines
+                    if line.quantity > 0
+                ]
         elif self.product_ids:
             quantity = self.quantity_per_product or 1
-            for product in self.product_ids:
-                lines_data.extend(
-                    self._prepare_label_data(product, quantity)
+            no_lot = self.env['stock.lot']
+            product_ids = self.product_ids.ids
+            for start in range(0, len(product_ids), batch_size):
+                products = self.env['product.product'].browse(
+                    product_ids[start:start + batch_size]
                 )
+                yield [(product, quantity, no_lot) for product in products]
 
-        # Return report action
-        return self.env.ref(
-            'barcode_scanner_label.action_report_product_label'
-        ).report_action(self, data={
+    def _get_label_prices(self, products):
+        """Compute the label price of several products at once.
+
+        Args:
+            products: product.product recordset
+
+        Returns:
+            dict mapping product id to price
+        """
+        if self.pricelist_id:
+            return self.pricelist_id._get_products_price(products, 1.0)
+        return {product.id: product.list_price for product in products}
+
+    def _iter_export_rows(self, batch_size=LINE_BATCH_SIZE):
+        """Yield the resolved label rows for an export, one dict per line.
+
+        The environment cache is invalidated after every batch so that
+        memory use does not grow with the number of exported rows.
+
+        Args:
+            batch_size: number of lines resolved per batch
+
+        Yields:
+            dictionaries keyed by ``EXPORT_FIELDS``
+        """
+        self.ensure_one()
+        symbology = self.template_id.barcode_type
+        pricelist_currency = self.pricelist_id.currency_id
+        for batch in self._iter_label_line_batches(batch_size):
+            products = self.env['product.product'].browse(
+                [product.id for product, _qty, _lot in batch]
+            )
+            prices = self._get_label_prices(products)
+            for product, quantity, lot in batch:
+                currency = pricelist_currency or product.currency_id
+                expiry = lot['expiration_date'] if 'expiration_date' in lot._fields else False
+                yield {
+                    'product': product.display_name,
+                    'default_code': product.default_code or '',
+                    'barcode': product.barcode or product.default_code or '',
+                    'symbology': symbology,
+                    'price': currency.round(prices.get(product.id, 0.0)),
+                    'currency': currency.name or '',
+                    'lot': lot.name or '',
+                    'expiry': fields.Datetime.to_string(expiry) if expiry else '',
+                    'quantity': quantity,
+                }
+            self.env.invalidate_all()
+
+    def _get_label_lines_data(self):
+        """Build the label data of every line, pricing products per batch.
+
+        Returns:
+            list of label data dictionaries
+        """
+        self.ensure_one()
+        lines_data = []
+        for batch in self._iter_label_line_batches():
+            products = self.env['product.product'].browse(
+                [product.id for product, _qty, _lot in batch]
+            )
+            prices = self._get_label_prices(products)
+            for product, quantity, lot in batch:
+                lines_data.extend(self._prepare_label_data(
+                    product, quantity, lot.name or '', prices.get(product.id, 0.0)
+                ))
+        return lines_data
+
+    def _get_report_data(self):
+        """Build the data passed to the label report.
+
+        Returns:
+            dictionary with the template, pricelist and label data
+        """
+        self.ensure_one()
+        return {
             'template_id': self.template_id.id,
-            'lines_data': lines_data,
+            'lines_data': self._get_label_lines_data(),
             'pricelist_id': self.pricelist_id.id if self.pricelist_id else False,
-        })
+        }
+
+    def _record_printed_labels(self, lines_data):
+        """Remember the price and barcode of the printed labels.
+
+        Args:
+            lines_data: list of label data dictionaries
+        """
+        self.env['product.label.print.history']._record_prints(
+            self.template_id,
+            self.pricelist_id,
+            {
+                label['product'].id: (label['price'], label['product'].barcode)
+                for label in lines_data
+            },
+        )
+
+    def _get_report_action(self, data):
+        """Get the label report action for the given report data."""
+        return self.env.ref(
+            'barcode_scanner_label.action_report_product_label'
+        ).report_action(self, data=data)
+
+    def action_print_labels(self):
+        """Generate and print labels."""
+        self.ensure_one()
+        data = self._get_report_data()
+        self._record_printed_labels(data['lines_data'])
+        return self._get_report_action(data)
+
+    def action_send_to_printer(self):
+        """Render the labels and send them straight to the network printer."""
+        self.ensure_one()
+        if not self.printer_id:
+            raise UserError(_('Please select a printer.'))
+
+        data = self._get_report_data()
+        pdf, _report_type = self.env['ir.actions.report']._render_qweb_pdf(
+            'barcode_scanner_label.action_report_product_label',
+            self.ids,
+            data=data,
+        )
+        self.printer_id._print_raw([pdf])
+        self._record_printed_labels(data['lines_data'])
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Labels Sent'),
+                'message': _('The labels were sent to %s.', self.printer_id.name),
+                'type': 'success',
+                'sticky': False,
+                'next': {'type': 'ir.actions.act_window_close'},
+            },
+        }
+
+    def _action_export(self, export_format):
+        """Download the resolved label rows as a streamed data file.
+
+        Args:
+            export_format: 'csv' or 'json'
+
+        Returns:
+            ir.actions.act_url dictionary
+        """
+        self.ensure_one()
+        if not self.line_ids and not self.product_ids:
+            raise UserError(_('There are no labels to export.'))
+        return {
+            'type': 'ir.actions.act_url',
+            'url': '/barcode_scanner_label/export/%s/%s' % (self.id, export_format),
+            'target': 'self',
+        }
+
+    def action_export_csv(self):
+        """Export label data as CSV for external label software."""
+        return self._action_export('csv')
+
+    def action_export_json(self):
+        """Export label data as JSON for external label software."""
+        return self._action_export('json')
 
     def action_preview(self):
-        """Preview labels (same as print but opens in new tab)."""
-        return self.action_print_labels()
+        """Preview labels without recording them as printed."""
+        self.ensure_one()
+        return self._get_report_action(self._get_report_data())